@@ -6,11 +6,14 @@ Author: Chief Data Strategist
 Purpose: Transform raw NBA data into actionable business insights
 """
 
+import json
 import streamlit as st
+import duckdb
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -72,71 +75,818 @@ st.markdown("""
 # ============================================================================
 # DATA LOADING & CLEANING
 # ============================================================================
+# Only the columns the dashboard actually uses are parsed and stored
+GAMES_COLS = ['GAME_ID', 'GAME_DATE_EST', 'SEASON', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID',
+              'PTS_home', 'PTS_away', 'HOME_TEAM_WINS']
+RANKING_COLS = ['TEAM_ID', 'SEASON_ID', 'STANDINGSDATE', 'CONFERENCE', 'W_PCT']
+GAMES_DETAILS_COLS = ['GAME_ID', 'PLAYER_NAME', 'PTS', 'FGA', 'FGM', 'AST', 'REB']
+
+# Compact dtypes, applied at parse time: int32 IDs, int16 seasons, float32 stats,
+# and categoricals for repeated string labels
+GAMES_DTYPES = {
+    'GAME_ID': 'int32', 'GAME_DATE_EST': 'datetime64[s]', 'SEASON': 'int16',
+    'HOME_TEAM_ID': 'int32', 'VISITOR_TEAM_ID': 'int32',
+    'PTS_home': 'float32', 'PTS_away': 'float32', 'HOME_TEAM_WINS': 'int8'
+}
+TEAMS_DTYPES = {
+    'TEAM_ID': 'int32', 'ABBREVIATION': 'category', 'NICKNAME': 'category', 'CITY': 'category'
+}
+RANKING_DTYPES = {
+    'TEAM_ID': 'int32', 'SEASON_ID': 'int32', 'STANDINGSDATE': 'datetime64[s]',
+    'CONFERENCE': 'category', 'W_PCT': 'float32'
+}
+GAMES_DETAILS_DTYPES = {
+    'GAME_ID': 'int32', 'PLAYER_NAME': 'category', 'PTS': 'float32', 'FGA': 'float32',
+    'FGM': 'float32', 'AST': 'float32', 'REB': 'float32'
+}
+
+
+def _ensure_parquet(csv_path, parquet_path, columns, dtype_map):
+    """Convert a (zipped) CSV to Snappy-compressed Parquet whenever the source is newer."""
+    import shutil
+    import zipfile
+    import os
+    
+    # Extract CSV from its zip if it doesn't exist or the zip has been replaced since
+    zip_path = csv_path + '.zip'
+    if os.path.exists(zip_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(zip_path) > os.path.getmtime(csv_path)
+    ):
+        tmp_path = f'{csv_path}.{os.getpid()}.tmp'
+        with zipfile.ZipFile(zip_path, 'r') as z, z.open(csv_path) as src, open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, csv_path)
+    
+    # Keep the existing Parquet if it is at least as new as the CSV and has every column
+    if os.path.exists(parquet_path):
+        csv_is_newer = os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path)
+        if not csv_is_newer and set(columns) <= set(pq.read_schema(parquet_path).names):
+            return
+    
+    # Arrow's multithreaded parser skips unused columns at parse time
+    # (categoricals are parsed as plain strings and converted on read)
+    column_types = {
+        col: pa.from_numpy_dtype(np.dtype(dtype))
+        for col, dtype in dtype_map.items() if dtype != 'category'
+    }
+    table = pv.read_csv(
+        csv_path,
+        read_options=pv.ReadOptions(block_size=32 << 20, use_threads=True),
+        convert_options=pv.ConvertOptions(include_columns=columns, column_types=column_types)
+    )
+    
+    # Write to a temp file first so an interrupted conversion never leaves a truncated Parquet
+    tmp_path = f'{parquet_path}.{os.getpid()}.tmp'
+    pq.write_table(table, tmp_path, compression='snappy')
+    os.replace(tmp_path, parquet_path)
+
+
+def _arrow_strings(arrow_type):
+    """Keep Arrow string columns Arrow-backed in pandas; numeric columns stay NumPy."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def _arrow_categories(frame):
+    """Relabel every categorical column with Arrow strings (codes are left untouched)."""
+    for col in frame.select_dtypes('category').columns:
+        labels = frame[col].cat.categories.astype(pd.ArrowDtype(pa.string()))
+        frame[col] = frame[col].cat.rename_categories(labels)
+    return frame
+
+
+def _read_parquet(parquet_path, columns, dtype_map):
+    """Read the needed columns of a Parquet file into pandas with minimal copying."""
+    table = pq.read_table(parquet_path, columns=columns)
+    return table.to_pandas(
+        split_blocks=True, self_destruct=True, types_mapper=_arrow_strings
+    ).astype(dtype_map)
+
+
+# Cleaned frames are persisted here so a server restart can skip the load/clean path
+CLEANED_CACHE_DIR = '.cache'
+CLEANED_FRAMES = ['games', 'teams', 'ranking', 'games_details']
+
+
+def _cleaned_cache_paths():
+    """Feather paths for the cleaned frames, keyed on the files the loader reads and its code."""
+    import hashlib
+    import os
+    
+    # The rebuild reads the Parquet files and teams.csv, so those are what the key tracks
+    # (_ensure_parquet has already refreshed the Parquet files from any newer CSV or zip)
+    sources = []
+    for path in ['games.parquet', 'teams.csv', 'ranking.parquet', 'games_details.parquet']:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            sources.append((path, stat.st_mtime, stat.st_size))
+    
+    # Editing this module (cleaning steps, column lists, dtypes) also invalidates the cache,
+    # just as it invalidates the in-memory @st.cache_data entry
+    with open(__file__, 'rb') as f:
+        sources.append(('code', hashlib.md5(f.read()).hexdigest()))
+    
+    # hashlib rather than hash(): str hashes are salted per process
+    cache_key = hashlib.md5(repr(sources).encode()).hexdigest()[:12]
+    return {
+        name: os.path.join(CLEANED_CACHE_DIR, f'{name}_{cache_key}.feather')
+        for name in CLEANED_FRAMES
+    }
+
+
 @st.cache_data
 def load_and_clean_data():
     """Load and preprocess all NBA data files."""
-    import zipfile
     import os
     
-    # Extract CSVs from zips if they don't exist
-    zip_files = ['games.csv.zip', 'ranking.csv.zip', 'games_details.csv.zip']
-    for zf in zip_files:
-        csv_name = zf.replace('.zip', '')
-        if not os.path.exists(csv_name) and os.path.exists(zf):
-            with zipfile.ZipFile(zf, 'r') as z:
-                z.extractall('.')
+    # Convert CSVs to Parquet once; later cache misses only read the Parquet files
+    _ensure_parquet('games.csv', 'games.parquet', GAMES_COLS, GAMES_DTYPES)
+    _ensure_parquet('ranking.csv', 'ranking.parquet', RANKING_COLS, RANKING_DTYPES)
+    _ensure_parquet('games_details.csv', 'games_details.parquet', GAMES_DETAILS_COLS, GAMES_DETAILS_DTYPES)
+    
+    # Reuse the cleaned frames from a previous run if the source files are unchanged
+    # (Feather restores categories with plain string labels, so relabel them as Arrow)
+    cache_paths = _cleaned_cache_paths()
+    if all(os.path.exists(path) for path in cache_paths.values()):
+        try:
+            return tuple(
+                _arrow_categories(pd.read_feather(cache_paths[name])) for name in CLEANED_FRAMES
+            )
+        except Exception:
+            pass  # Unreadable cache files are simply rebuilt and overwritten below
     
-    # Load CSVs
-    games = pd.read_csv('games.csv')
-    teams = pd.read_csv('teams.csv')
-    ranking = pd.read_csv('ranking.csv')
-    games_details = pd.read_csv('games_details.csv', low_memory=False)
+    # Load data, reading only the needed columns
+    games = _read_parquet('games.parquet', GAMES_COLS, GAMES_DTYPES)
+    teams = _arrow_categories(pd.read_csv('teams.csv', dtype=TEAMS_DTYPES))
+    ranking = _read_parquet('ranking.parquet', RANKING_COLS, RANKING_DTYPES)
+    games_details = _read_parquet('games_details.parquet', GAMES_DETAILS_COLS, GAMES_DETAILS_DTYPES)
     
     # Clean games data
-    games['GAME_DATE_EST'] = pd.to_datetime(games['GAME_DATE_EST'], errors='coerce')
-    games['SEASON'] = games['SEASON'].astype(int)
     games = games[games['SEASON'] >= 2004]  # Filter for 2004 onwards
     
     # Handle missing values - drop games with missing scores for accurate analysis
     games = games.dropna(subset=['PTS_home', 'PTS_away'])
-    games['PTS_home'] = games['PTS_home'].astype(float)
-    games['PTS_away'] = games['PTS_away'].astype(float)
     
     # Create Total Points column for game excitement analysis
     games['TOTAL_POINTS'] = games['PTS_home'] + games['PTS_away']
     
-    # Merge games with teams for home and visitor names
-    games = games.merge(
-        teams[['TEAM_ID', 'ABBREVIATION', 'NICKNAME', 'CITY']],
-        left_on='HOME_TEAM_ID',
-        right_on='TEAM_ID',
-        how='left'
-    ).rename(columns={'ABBREVIATION': 'HOME_ABBR', 'NICKNAME': 'HOME_TEAM', 'CITY': 'HOME_CITY'})
-    
-    games = games.merge(
-        teams[['TEAM_ID', 'ABBREVIATION', 'NICKNAME', 'CITY']],
-        left_on='VISITOR_TEAM_ID',
-        right_on='TEAM_ID',
-        how='left',
-        suffixes=('', '_visitor')
-    ).rename(columns={'ABBREVIATION': 'VISITOR_ABBR', 'NICKNAME': 'VISITOR_TEAM', 'CITY': 'VISITOR_CITY'})
+    # Attach home and visitor names via TEAM_ID lookups (teams is a 30-row table)
+    team_lookup = teams.set_index('TEAM_ID')
+    for side in ['HOME', 'VISITOR']:
+        for source_col, target_col in [('ABBREVIATION', 'ABBR'), ('NICKNAME', 'TEAM'), ('CITY', 'CITY')]:
+            games[f'{side}_{target_col}'] = (
+                games[f'{side}_TEAM_ID'].map(team_lookup[source_col].to_dict()).astype('category')
+            )
+    games = _arrow_categories(games)
     
     # Clean ranking data
     # SEASON_ID format: SeasonType (1-2 digits) + Year (4 digits), e.g., 22022 = Regular 2022-23
-    # Extract the year portion correctly
-    ranking['SEASON_YEAR'] = ranking['SEASON_ID'].apply(
-        lambda x: int(str(x)[-4:]) if len(str(x)) >= 4 else int(str(x))
-    )
+    # Extract the year portion correctly: the last 4 digits are just SEASON_ID % 10000
+    # (IDs shorter than 4 digits are returned unchanged, matching the string slice)
+    ranking['SEASON_YEAR'] = (ranking['SEASON_ID'].to_numpy(dtype=np.int32) % 10000).astype(np.int16)
     ranking = ranking[ranking['SEASON_YEAR'] >= 2004]
     
-    # Clean games_details
-    games_details['PTS'] = pd.to_numeric(games_details['PTS'], errors='coerce').fillna(0)
-    games_details['FGA'] = pd.to_numeric(games_details['FGA'], errors='coerce').fillna(0)
-    games_details['FGM'] = pd.to_numeric(games_details['FGM'], errors='coerce').fillna(0)
-    games_details['AST'] = pd.to_numeric(games_details['AST'], errors='coerce').fillna(0)
-    games_details['REB'] = pd.to_numeric(games_details['REB'], errors='coerce').fillna(0)
+    # Clean games_details (stats are already float32; DNP rows are blank)
+    stat_cols = ['PTS', 'FGA', 'FGM', 'AST', 'REB']
+    games_details[stat_cols] = games_details[stat_cols].fillna(0)
+    
+    # Tag each player line with its game's season so tabs can filter with a plain
+    # int16 comparison; lines from games dropped above (pre-2004, no score) go too
+    game_to_season = dict(zip(games['GAME_ID'].to_numpy(), games['SEASON'].to_numpy()))
+    games_details['SEASON'] = games_details['GAME_ID'].map(game_to_season)
+    games_details = games_details.dropna(subset=['SEASON'])
+    games_details['SEASON'] = games_details['SEASON'].astype('int16')
+    
+    # Persist the cleaned frames (Feather needs a default index)
+    cleaned = tuple(
+        frame.reset_index(drop=True) for frame in (games, teams, ranking, games_details)
+    )
+    # Each file is written to a temp path and renamed, so a concurrent reader
+    # never sees a half-written frame
+    os.makedirs(CLEANED_CACHE_DIR, exist_ok=True)
+    for name, frame in zip(CLEANED_FRAMES, cleaned):
+        tmp_path = f'{cache_paths[name]}.{os.getpid()}.tmp'
+        frame.to_feather(tmp_path)
+        os.replace(tmp_path, cache_paths[name])
+    
+    # Only then drop frames cached under older keys
+    current = {os.path.basename(path) for path in cache_paths.values()}
+    for entry in os.listdir(CLEANED_CACHE_DIR):
+        if entry.endswith('.feather') and entry not in current:
+            try:
+                os.remove(os.path.join(CLEANED_CACHE_DIR, entry))
+            except FileNotFoundError:
+                pass  # Another server process already removed it
+    
+    return cleaned
+
+
+# ============================================================================
+# CACHED AGGREGATIONS
+# ============================================================================
+# Frames passed with a leading underscore come straight from load_and_clean_data
+# and never change, so Streamlit skips hashing them on every rerun.
+@st.cache_data
+def get_season_trends(_games):
+    """Per-season scoring average and home win percentage, from one pass over games."""
+    # np.unique sorts the seasons, and bincount over the inverse index sums the
+    # points and home wins of each season in a single sweep of the columns
+    seasons, season_idx = np.unique(_games['SEASON'].to_numpy(), return_inverse=True)
+    total_points = _games['TOTAL_POINTS'].to_numpy(dtype=np.float32)
+    home_wins = _games['HOME_TEAM_WINS'].to_numpy(dtype=np.int8)
+    
+    games_count = np.bincount(season_idx)
+    points_sum = np.bincount(season_idx, weights=total_points)
+    home_wins_sum = np.bincount(season_idx, weights=home_wins).astype(np.int64)
+    
+    return pd.DataFrame({
+        'SEASON': seasons,
+        'TOTAL_POINTS': points_sum / games_count,
+        'HOME_WINS': home_wins_sum,
+        'TOTAL_GAMES': games_count,
+        'HOME_WIN_PCT': home_wins_sum / games_count * 100
+    })
+
+
+@st.cache_data
+def get_team_games(_games):
+    """One row per team per game: season, date, home flag and whether the team won."""
+    home = _games[['SEASON', 'GAME_DATE_EST', 'HOME_TEAM_ID', 'HOME_TEAM_WINS']].rename(
+        columns={'HOME_TEAM_ID': 'TEAM_ID', 'HOME_TEAM_WINS': 'WON'}
+    ).assign(IS_HOME=1)
+    away = _games[['SEASON', 'GAME_DATE_EST', 'VISITOR_TEAM_ID', 'HOME_TEAM_WINS']].rename(
+        columns={'VISITOR_TEAM_ID': 'TEAM_ID'}
+    ).assign(IS_HOME=0, WON=lambda d: 1 - d['HOME_TEAM_WINS']).drop(columns='HOME_TEAM_WINS')
+    return pd.concat([home, away], ignore_index=True)
+
+
+@st.cache_data
+def get_team_season_record(_games):
+    """Home and road wins/losses for every team in every season, indexed by (TEAM_ID, SEASON)."""
+    team_games = get_team_games(_games)
+    record = team_games.groupby(['TEAM_ID', 'SEASON', 'IS_HOME']).agg(
+        WINS=('WON', 'sum'),
+        GAMES=('WON', 'count')
+    )
+    record['LOSSES'] = record['GAMES'] - record['WINS']
+    
+    # One row per (TEAM_ID, SEASON) with HOME_/AWAY_ columns for O(1) lookups
+    record = record[['WINS', 'LOSSES']].unstack('IS_HOME', fill_value=0)
+    record.columns = [f"{'HOME' if is_home else 'AWAY'}_{stat}" for stat, is_home in record.columns]
+    return record
+
+
+@st.cache_data
+def get_latest_rankings(_ranking):
+    """Final standings row for every team in every season."""
+    # Get the latest standings date per season for accuracy
+    # (STANDINGSDATE is already datetime64 from the loader, so a single sort orders it)
+    return _ranking.sort_values('STANDINGSDATE', kind='mergesort').drop_duplicates(
+        ['SEASON_ID', 'TEAM_ID'], keep='last'
+    )
+
+
+@st.cache_data
+def get_player_season_agg(_games_details):
+    """Season totals and games played for every player in every season."""
+    # DuckDB scans the frame in place and runs the grouped sums multi-threaded
+    with duckdb.connect() as con:
+        con.register('gd', _games_details)
+        return con.execute("""
+            SELECT SEASON, PLAYER_NAME,
+                   SUM(FGA) AS TOTAL_FGA,
+                   SUM(PTS) AS TOTAL_PTS,
+                   SUM(FGM) AS TOTAL_FGM,
+                   SUM(AST) AS TOTAL_AST,
+                   SUM(REB) AS TOTAL_REB,
+                   COUNT(*) AS GAMES_PLAYED
+            FROM gd
+            GROUP BY SEASON, PLAYER_NAME
+        """).df()
+
+
+# ============================================================================
+# CHART BUILDERS
+# ============================================================================
+# Figures are cached as Plotly JSON keyed on plain tuples/scalars, so reruns
+# skip building the figure (st.plotly_chart still validates and re-serializes
+# the dict it is given). Plotly itself is imported lazily so it is only loaded
+# once a chart actually has to be built.
+# Builders keyed on sidebar/slider selections get a bounded, expiring cache
+# so long-running sessions don't accumulate one figure per combination.
+FIGURE_CACHE_ENTRIES = 64
+FIGURE_CACHE_TTL = '1h'
+
+
+@st.cache_data
+def build_scoring_fig(seasons, total_points):
+    """Average total points per game by season, with the 3-point era marked."""
+    import plotly.graph_objects as go
+    
+    fig_scoring = go.Figure()
+    
+    fig_scoring.add_trace(go.Scatter(
+        x=seasons,
+        y=total_points,
+        mode='lines+markers',
+        name='Total Points',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)'
+    ))
+    
+    fig_scoring.update_layout(
+        title=dict(text='Average Total Points Per Game (2004–Present)', font=dict(size=18)),
+        xaxis_title='Season',
+        yaxis_title='Average Points',
+        template='plotly_dark',
+        height=400,
+        hovermode='x unified'
+    )
+    
+    # Add annotation for 3-point revolution
+    if 2015 in seasons:
+        fig_scoring.add_annotation(
+            x=2015, y=total_points[seasons.index(2015)] + 5,
+            text="3-Point Revolution Era Begins",
+            showarrow=True,
+            arrowhead=2,
+            arrowcolor='#ff6b6b',
+            font=dict(color='#ff6b6b', size=11)
+        )
+    
+    return fig_scoring.to_json()
+
+
+@st.cache_data
+def build_home_away_fig(home_pct, away_pct):
+    """Grouped bars of the league-wide home vs away win percentage."""
+    import plotly.graph_objects as go
+    
+    fig_home_away = go.Figure(data=[
+        go.Bar(
+            name='Home Wins',
+            x=['Win Rate'],
+            y=[home_pct],
+            marker_color='#667eea',
+            text=[f'{home_pct:.1f}%'],
+            textposition='auto'
+        ),
+        go.Bar(
+            name='Away Wins',
+            x=['Win Rate'],
+            y=[away_pct],
+            marker_color='#f093fb',
+            text=[f'{away_pct:.1f}%'],
+            textposition='auto'
+        )
+    ])
+    
+    fig_home_away.update_layout(
+        title='Global Home vs Away Win Percentage',
+        template='plotly_dark',
+        barmode='group',
+        height=350,
+        yaxis_title='Win Percentage (%)'
+    )
+    
+    return fig_home_away.to_json()
+
+
+@st.cache_data
+def build_home_trend_fig(seasons, home_win_pct):
+    """Home win percentage by season against a 50% baseline."""
+    import plotly.express as px
+    
+    fig_home_trend = px.line(
+        pd.DataFrame({'SEASON': seasons, 'HOME_WIN_PCT': home_win_pct}),
+        x='SEASON',
+        y='HOME_WIN_PCT',
+        markers=True,
+        title='Home Court Advantage Trend by Season'
+    )
+    
+    fig_home_trend.add_hline(y=50, line_dash="dash", line_color="red", 
+                              annotation_text="50% Baseline")
+    
+    fig_home_trend.update_traces(line_color='#764ba2', line_width=2)
+    fig_home_trend.update_layout(
+        template='plotly_dark',
+        height=350,
+        yaxis_title='Home Win %'
+    )
+    
+    return fig_home_trend.to_json()
+
+
+@st.cache_data
+def build_conference_trend_fig(season_years, conferences, w_pcts):
+    """Average win rate per conference by season."""
+    import plotly.express as px
+    
+    fig_conf = px.line(
+        pd.DataFrame({'SEASON_YEAR': season_years, 'CONFERENCE': conferences, 'W_PCT': w_pcts}),
+        x='SEASON_YEAR',
+        y='W_PCT',
+        color='CONFERENCE',
+        markers=True,
+        title='Average Win Rate by Conference Over Time',
+        color_discrete_map={'East': '#667eea', 'West': '#f093fb'}
+    )
+    
+    fig_conf.update_layout(
+        template='plotly_dark',
+        height=400,
+        yaxis_title='Average Win %',
+        xaxis_title='Season'
+    )
+    
+    return fig_conf.to_json()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, ttl=FIGURE_CACHE_TTL)
+def build_conference_box_fig(conferences, w_pcts, season):
+    """Distribution of final team win percentages per conference for one season."""
+    import plotly.express as px
+    
+    conf_box = px.box(
+        pd.DataFrame({'CONFERENCE': conferences, 'W_PCT': w_pcts}),
+        x='CONFERENCE',
+        y='W_PCT',
+        color='CONFERENCE',
+        title=f'Win % Distribution by Conference ({season})',
+        color_discrete_map={'East': '#667eea', 'West': '#f093fb'},
+        category_orders={'CONFERENCE': ['East', 'West']}
+    )
+    conf_box.update_layout(template='plotly_dark', height=400)
+    
+    return conf_box.to_json()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, ttl=FIGURE_CACHE_TTL)
+def build_team_trend_fig(games_played, win_pct, team, season):
+    """Running win percentage of one team over a season."""
+    import plotly.graph_objects as go
+    
+    fig_trend = go.Figure()
+    
+    fig_trend.add_trace(go.Scatter(
+        x=games_played,
+        y=win_pct,
+        mode='lines+markers',
+        name='Win %',
+        line=dict(color='#667eea', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.3)'
+    ))
+    
+    fig_trend.add_hline(y=50, line_dash="dash", line_color="orange",
+                         annotation_text=".500 Record")
+    
+    fig_trend.update_layout(
+        title=f'{team} Win Percentage Trend ({season})',
+        xaxis_title='Games Played',
+        yaxis_title='Win Percentage (%)',
+        template='plotly_dark',
+        height=400
+    )
+    
+    return fig_trend.to_json()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, ttl=FIGURE_CACHE_TTL)
+def build_player_fig(player_names, usage_rates, ppgs, games_played, fg_pcts, season, median_x, median_y):
+    """Usage vs scoring scatter of qualified players, split into quadrants at the medians."""
+    import plotly.express as px
+    
+    fig_player = px.scatter(
+        pd.DataFrame({
+            'PLAYER_NAME': player_names,
+            'USAGE_RATE': usage_rates,
+            'PPG': ppgs,
+            'GAMES_PLAYED': games_played,
+            'FG_PCT': fg_pcts
+        }),
+        x='USAGE_RATE',
+        y='PPG',
+        size='GAMES_PLAYED',
+        color='FG_PCT',
+        hover_name='PLAYER_NAME',
+        hover_data={
+            'USAGE_RATE': ':.1f',
+            'PPG': ':.1f',
+            'FG_PCT': ':.1f',
+            'GAMES_PLAYED': True
+        },
+        title=f'Player Usage (FGA/Game) vs Efficiency (PPG) - {season}',
+        color_continuous_scale='Viridis'
+    )
+    
+    fig_player.update_layout(
+        template='plotly_dark',
+        height=500,
+        xaxis_title='Usage (FGA per Game)',
+        yaxis_title='Points per Game',
+        coloraxis_colorbar_title='FG%'
+    )
+    
+    # Add quadrant lines
+    fig_player.add_hline(y=median_y, line_dash="dot", line_color="gray", opacity=0.5)
+    fig_player.add_vline(x=median_x, line_dash="dot", line_color="gray", opacity=0.5)
+    
+    return fig_player.to_json()
+
+
+# ============================================================================
+# TAB RENDERERS
+# ============================================================================
+# Only the open tab is rendered on each run, so hidden tabs cost nothing.
+def render_macro_trends(games):
+    """Tab 1: league scoring evolution and home court advantage."""
+    st.markdown('<p class="section-title">Strategic League Trends: The Evolution of NBA Scoring</p>', unsafe_allow_html=True)
+    
+    # Scoring and home advantage per season (one cached pass over games)
+    season_trends = get_season_trends(games)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Average League Scoring per Season
+        fig_scoring = build_scoring_fig(
+            tuple(season_trends['SEASON'].tolist()),
+            tuple(season_trends['TOTAL_POINTS'].tolist())
+        )
+        
+        st.plotly_chart(json.loads(fig_scoring), width='stretch')
+    
+    with col2:
+        st.markdown("### 📊 Key Insights")
+        
+        # Calculate trend
+        recent_avg = season_trends[season_trends['SEASON'] >= 2018]['TOTAL_POINTS'].mean()
+        early_avg = season_trends[season_trends['SEASON'] <= 2010]['TOTAL_POINTS'].mean()
+        pct_change = ((recent_avg - early_avg) / early_avg) * 100
+        
+        trend_direction = "📈 **Upward Trend**" if pct_change > 0 else "📉 **Downward Trend**"
+        
+        st.markdown(f"""
+        <div class="insight-box">
+        <strong>{trend_direction}</strong><br><br>
+        NBA scoring has changed by <strong>{pct_change:.1f}%</strong> from the early 2000s to recent seasons.<br><br>
+        <em>Note the spike in scoring post-2015, correlating with the league-wide 
+        shift to perimeter shooting and pace-and-space offense.</em>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Home vs Away Win Percentage Analysis
+    st.markdown('<p class="section-title">Home Court Advantage: A Strategic Analysis</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Calculate home vs away wins from the cached per-season totals
+        total_games_played = season_trends['TOTAL_GAMES'].sum()
+        home_wins = season_trends['HOME_WINS'].sum()
+        away_wins = total_games_played - home_wins
+        
+        home_pct = (home_wins / total_games_played) * 100
+        away_pct = (away_wins / total_games_played) * 100
+        
+        fig_home_away = build_home_away_fig(float(home_pct), float(away_pct))
+        
+        st.plotly_chart(json.loads(fig_home_away), width='stretch')
+    
+    with col2:
+        # Home advantage trend over seasons
+        fig_home_trend = build_home_trend_fig(
+            tuple(season_trends['SEASON'].tolist()),
+            tuple(season_trends['HOME_WIN_PCT'].tolist())
+        )
+        
+        st.plotly_chart(json.loads(fig_home_trend), width='stretch')
+    
+    # Business insight for home advantage
+    st.markdown(f"""
+    <div class="insight-box">
+    <strong>🏠 Strategic Insight: Home Court Advantage</strong><br><br>
+    Historically, home teams win approximately <strong>{home_pct:.1f}%</strong> of games, 
+    representing a <strong>{home_pct - 50:.1f}%</strong> advantage over pure chance.<br><br>
+    <em>This has significant implications for playoff seeding strategy and 
+    ticket revenue projections. Teams should prioritize securing home court advantage 
+    in playoff positioning.</em>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def render_team_dynamics(games, teams, ranking, selected_season, selected_team):
+    """Tab 2: East vs West comparison and the selected team's season."""
+    st.markdown('<p class="section-title">Conference Comparison: East vs West</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Conference win rates from ranking data
+        latest_rankings = get_latest_rankings(ranking)
+        
+        conf_comparison = latest_rankings.groupby(
+            ['SEASON_YEAR', 'CONFERENCE'], observed=True, sort=False
+        ).agg({
+            'W_PCT': 'mean'
+        }).reset_index().sort_values(['SEASON_YEAR', 'CONFERENCE'])
+        
+        fig_conf = build_conference_trend_fig(
+            tuple(conf_comparison['SEASON_YEAR'].tolist()),
+            tuple(conf_comparison['CONFERENCE'].tolist()),
+            tuple(conf_comparison['W_PCT'].tolist())
+        )
+        
+        st.plotly_chart(json.loads(fig_conf), width='stretch')
     
-    return games, teams, ranking, games_details
+    with col2:
+        # Overall conference comparison for selected season
+        season_ranking = latest_rankings[latest_rankings['SEASON_YEAR'] == selected_season]
+        
+        if not season_ranking.empty:
+            conf_box = build_conference_box_fig(
+                tuple(season_ranking['CONFERENCE'].tolist()),
+                tuple(season_ranking['W_PCT'].tolist()),
+                int(selected_season)
+            )
+            st.plotly_chart(json.loads(conf_box), width='stretch')
+        else:
+            st.info(f"No ranking data available for {selected_season}")
+    
+    st.markdown("---")
+    st.markdown('<p class="section-title">Selected Team Performance Analysis</p>', unsafe_allow_html=True)
+    
+    if selected_team != 'All Teams':
+        # Get team ID
+        team_info = teams[teams['NICKNAME'] == selected_team]
+        
+        if not team_info.empty:
+            team_id = team_info['TEAM_ID'].values[0]
+            
+            # Look up wins and losses for selected team and season
+            team_record = get_team_season_record(games)
+            if (team_id, selected_season) in team_record.index:
+                season_record = team_record.loc[(team_id, selected_season)]
+            else:
+                season_record = pd.Series(0, index=team_record.columns)
+            
+            home_wins = int(season_record['HOME_WINS'])
+            home_losses = int(season_record['HOME_LOSSES'])
+            away_wins = int(season_record['AWAY_WINS'])
+            away_losses = int(season_record['AWAY_LOSSES'])
+            
+            total_wins = home_wins + away_wins
+            total_losses = home_losses + away_losses
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            col1.metric("Total Wins", total_wins)
+            col2.metric("Total Losses", total_losses)
+            col3.metric("Home Record", f"{home_wins}-{home_losses}")
+            col4.metric("Road Record", f"{away_wins}-{away_losses}")
+            
+            # Create win/loss trend over the season
+            team_games = get_team_games(games)
+            team_games = team_games[
+                (team_games['TEAM_ID'] == team_id) & (team_games['SEASON'] == selected_season)
+            ].sort_values('GAME_DATE_EST', kind='mergesort')
+            
+            if not team_games.empty:
+                wins = team_games['WON'].to_numpy(dtype=np.int16)
+                cumulative_wins = np.cumsum(wins)
+                games_played = np.arange(1, wins.size + 1, dtype=np.int16)
+                win_pct = cumulative_wins / games_played
+                
+                fig_trend = build_team_trend_fig(
+                    tuple(games_played.tolist()),
+                    tuple((win_pct * 100).tolist()),
+                    selected_team,
+                    int(selected_season)
+                )
+                
+                st.plotly_chart(json.loads(fig_trend), width='stretch')
+                
+                # Business insight
+                final_win_pct = (total_wins / (total_wins + total_losses)) * 100 if (total_wins + total_losses) > 0 else 0
+                
+                st.markdown(f"""
+                <div class="insight-box">
+                <strong>🎯 Team Performance Summary: {selected_team}</strong><br><br>
+                The {selected_team} finished the {selected_season} season with a 
+                <strong>{final_win_pct:.1f}%</strong> win rate ({total_wins}-{total_losses}).<br><br>
+                <em>{'Strong playoff contender status maintained.' if final_win_pct >= 60 else 
+                   'Reliable mid-tier performance.' if final_win_pct >= 45 else
+                   'Rebuilding phase indicated.'}</em>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.warning(f"No game data found for {selected_team} in {selected_season}")
+        else:
+            st.warning("Team not found in database")
+    else:
+        st.info("👆 Select a specific team from the sidebar to view detailed performance analysis.")
+
+
+def render_player_impact(games_details, selected_season):
+    """Tab 3: usage vs efficiency of qualified players."""
+    st.markdown('<p class="section-title">Player Efficiency Analysis: Usage vs. Output</p>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    This analysis identifies key performers by comparing their **shot attempts (Usage)** 
+    against **points scored (Efficiency)**. Players in the upper-right quadrant 
+    represent high-volume, high-efficiency scorers.
+    """)
+    
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        # Player stats for the selected season (aggregated once for all seasons)
+        player_season_agg = get_player_season_agg(games_details)
+        player_agg = player_season_agg[player_season_agg['SEASON'] == selected_season]
+        
+        # Filter for players with sufficient attempts
+        min_games = st.slider("Minimum Games Played", 10, 50, key='min_games')
+        min_fga = st.slider("Minimum Field Goal Attempts", 50, 500, key='min_fga')
+        
+        qualified_players = player_agg.query('GAMES_PLAYED >= @min_games and TOTAL_FGA >= @min_fga')
+        
+        # Derive all rate columns in one assign instead of three column writes on a slice
+        fga = qualified_players['TOTAL_FGA'].to_numpy()
+        fgm = qualified_players['TOTAL_FGM'].to_numpy()
+        pts = qualified_players['TOTAL_PTS'].to_numpy()
+        games_played = qualified_players['GAMES_PLAYED'].to_numpy()
+        qualified_players = qualified_players.assign(
+            FG_PCT=fgm / fga * 100,
+            PPG=pts / games_played,
+            USAGE_RATE=fga / games_played
+        )
+        
+        st.markdown(f"**{len(qualified_players)}** players qualified")
+    
+    with col2:
+        if not qualified_players.empty:
+            # Quadrant lines sit at the medians
+            median_x = qualified_players['USAGE_RATE'].median()
+            median_y = qualified_players['PPG'].median()
+            
+            fig_player = build_player_fig(
+                tuple(qualified_players['PLAYER_NAME'].tolist()),
+                tuple(qualified_players['USAGE_RATE'].tolist()),
+                tuple(qualified_players['PPG'].tolist()),
+                tuple(qualified_players['GAMES_PLAYED'].tolist()),
+                tuple(qualified_players['FG_PCT'].tolist()),
+                int(selected_season),
+                float(median_x),
+                float(median_y)
+            )
+            
+            st.plotly_chart(json.loads(fig_player), width='stretch')
+            
+            # Top performers
+            st.markdown("### 🌟 Top Performers (High Usage + High Efficiency)")
+            
+            upper_right = qualified_players.query('USAGE_RATE > @median_x and PPG > @median_y')
+            
+            # Partial sort: pick the 10 best PPG in O(n), then order just those 10
+            top_n = min(10, len(upper_right))
+            top_idx = np.argpartition(-upper_right['PPG'].to_numpy(), top_n - 1)[:top_n] if top_n else []
+            top_performers = upper_right.iloc[top_idx].sort_values('PPG', ascending=False)
+            
+            top_performers = top_performers[['PLAYER_NAME', 'PPG', 'USAGE_RATE', 'FG_PCT', 'GAMES_PLAYED']]
+            top_performers.columns = ['Player', 'PPG', 'FGA/Game', 'FG%', 'Games']
+            
+            st.dataframe(
+                top_performers.style.format({
+                    'PPG': '{:.1f}',
+                    'FGA/Game': '{:.1f}',
+                    'FG%': '{:.1f}%'
+                }),
+                width='stretch',
+                hide_index=True
+            )
+            
+            # Business insight
+            if len(top_performers) > 0:
+                top_player = top_performers.iloc[0]['Player']
+                st.markdown(f"""
+                <div class="insight-box">
+                <strong>💎 Player Efficiency Insight</strong><br><br>
+                <strong>{top_player}</strong> leads as the most impactful scorer in {selected_season}, 
+                combining elite volume shooting with exceptional efficiency.<br><br>
+                <em>Players in the upper-right quadrant are the "franchise cornerstones" — 
+                they can handle high-volume offensive responsibility while maintaining 
+                above-average conversion rates. These are the assets worth investing in.</em>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.warning("No players meet the minimum criteria. Try lowering the filters.")
 
 
 # Load data
@@ -190,426 +940,30 @@ if data_loaded:
     st.markdown('<h1 class="main-header">🏀 Statistella Strategic Dashboard</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Transforming NBA Data into Business Intelligence | 2004–Present</p>', unsafe_allow_html=True)
     
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs(["📈 **Macro Trends**", "🏆 **Team & Conference Dynamics**", "👤 **Player Impact Analysis**"])
+    # Slider values live in session state so they survive while their tab is hidden
+    # (Streamlit otherwise drops the state of widgets that were not rendered)
+    st.session_state['min_games'] = st.session_state.get('min_games', 20)
+    st.session_state['min_fga'] = st.session_state.get('min_fga', 200)
+    
+    # Create tabs for different sections; the active tab is tracked in session state
+    # (st.session_state.active_tab) and switching tabs reruns the script
+    tab1, tab2, tab3 = st.tabs(
+        ["📈 **Macro Trends**", "🏆 **Team & Conference Dynamics**", "👤 **Player Impact Analysis**"],
+        key='active_tab',
+        on_change='rerun'
+    )
     
-    # ============================================================================
-    # TAB 1: MACRO VIEW (STRATEGIC TRENDS)
-    # ============================================================================
     with tab1:
-        st.markdown('<p class="section-title">Strategic League Trends: The Evolution of NBA Scoring</p>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Average League Scoring per Season
-            scoring_trend = games.groupby('SEASON').agg({
-                'PTS_home': 'mean',
-                'PTS_away': 'mean',
-                'TOTAL_POINTS': 'mean'
-            }).reset_index()
-            
-            fig_scoring = go.Figure()
-            
-            fig_scoring.add_trace(go.Scatter(
-                x=scoring_trend['SEASON'],
-                y=scoring_trend['TOTAL_POINTS'],
-                mode='lines+markers',
-                name='Total Points',
-                line=dict(color='#667eea', width=3),
-                marker=dict(size=8),
-                fill='tozeroy',
-                fillcolor='rgba(102, 126, 234, 0.2)'
-            ))
-            
-            fig_scoring.update_layout(
-                title=dict(text='Average Total Points Per Game (2004–Present)', font=dict(size=18)),
-                xaxis_title='Season',
-                yaxis_title='Average Points',
-                template='plotly_dark',
-                height=400,
-                hovermode='x unified'
-            )
-            
-            # Add annotation for 3-point revolution
-            if 2015 in scoring_trend['SEASON'].values:
-                pts_2015 = scoring_trend[scoring_trend['SEASON'] == 2015]['TOTAL_POINTS'].values
-                if len(pts_2015) > 0:
-                    fig_scoring.add_annotation(
-                        x=2015, y=pts_2015[0] + 5,
-                        text="3-Point Revolution Era Begins",
-                        showarrow=True,
-                        arrowhead=2,
-                        arrowcolor='#ff6b6b',
-                        font=dict(color='#ff6b6b', size=11)
-                    )
-            
-            st.plotly_chart(fig_scoring, use_container_width=True)
-        
-        with col2:
-            st.markdown("### 📊 Key Insights")
-            
-            # Calculate trend
-            recent_avg = scoring_trend[scoring_trend['SEASON'] >= 2018]['TOTAL_POINTS'].mean()
-            early_avg = scoring_trend[scoring_trend['SEASON'] <= 2010]['TOTAL_POINTS'].mean()
-            pct_change = ((recent_avg - early_avg) / early_avg) * 100
-            
-            trend_direction = "📈 **Upward Trend**" if pct_change > 0 else "📉 **Downward Trend**"
-            
-            st.markdown(f"""
-            <div class="insight-box">
-            <strong>{trend_direction}</strong><br><br>
-            NBA scoring has changed by <strong>{pct_change:.1f}%</strong> from the early 2000s to recent seasons.<br><br>
-            <em>Note the spike in scoring post-2015, correlating with the league-wide 
-            shift to perimeter shooting and pace-and-space offense.</em>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Home vs Away Win Percentage Analysis
-        st.markdown('<p class="section-title">Home Court Advantage: A Strategic Analysis</p>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Calculate home vs away wins
-            total_games_played = len(games.dropna(subset=['HOME_TEAM_WINS']))
-            home_wins = games['HOME_TEAM_WINS'].sum()
-            away_wins = total_games_played - home_wins
-            
-            home_pct = (home_wins / total_games_played) * 100
-            away_pct = (away_wins / total_games_played) * 100
-            
-            fig_home_away = go.Figure(data=[
-                go.Bar(
-                    name='Home Wins',
-                    x=['Win Rate'],
-                    y=[home_pct],
-                    marker_color='#667eea',
-                    text=[f'{home_pct:.1f}%'],
-                    textposition='auto'
-                ),
-                go.Bar(
-                    name='Away Wins',
-                    x=['Win Rate'],
-                    y=[away_pct],
-                    marker_color='#f093fb',
-                    text=[f'{away_pct:.1f}%'],
-                    textposition='auto'
-                )
-            ])
-            
-            fig_home_away.update_layout(
-                title='Global Home vs Away Win Percentage',
-                template='plotly_dark',
-                barmode='group',
-                height=350,
-                yaxis_title='Win Percentage (%)'
-            )
-            
-            st.plotly_chart(fig_home_away, use_container_width=True)
-        
-        with col2:
-            # Home advantage trend over seasons
-            home_adv_trend = games.groupby('SEASON').agg({
-                'HOME_TEAM_WINS': ['sum', 'count']
-            }).reset_index()
-            home_adv_trend.columns = ['SEASON', 'HOME_WINS', 'TOTAL_GAMES']
-            home_adv_trend['HOME_WIN_PCT'] = (home_adv_trend['HOME_WINS'] / home_adv_trend['TOTAL_GAMES']) * 100
-            
-            fig_home_trend = px.line(
-                home_adv_trend,
-                x='SEASON',
-                y='HOME_WIN_PCT',
-                markers=True,
-                title='Home Court Advantage Trend by Season'
-            )
-            
-            fig_home_trend.add_hline(y=50, line_dash="dash", line_color="red", 
-                                      annotation_text="50% Baseline")
-            
-            fig_home_trend.update_traces(line_color='#764ba2', line_width=2)
-            fig_home_trend.update_layout(
-                template='plotly_dark',
-                height=350,
-                yaxis_title='Home Win %'
-            )
-            
-            st.plotly_chart(fig_home_trend, use_container_width=True)
-        
-        # Business insight for home advantage
-        st.markdown(f"""
-        <div class="insight-box">
-        <strong>🏠 Strategic Insight: Home Court Advantage</strong><br><br>
-        Historically, home teams win approximately <strong>{home_pct:.1f}%</strong> of games, 
-        representing a <strong>{home_pct - 50:.1f}%</strong> advantage over pure chance.<br><br>
-        <em>This has significant implications for playoff seeding strategy and 
-        ticket revenue projections. Teams should prioritize securing home court advantage 
-        in playoff positioning.</em>
-        </div>
-        """, unsafe_allow_html=True)
+        if tab1.open:
+            render_macro_trends(games)
     
-    # ============================================================================
-    # TAB 2: TEAM & CONFERENCE DYNAMICS
-    # ============================================================================
     with tab2:
-        st.markdown('<p class="section-title">Conference Comparison: East vs West</p>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Conference win rates from ranking data
-            # Get the latest standings date per season for accuracy
-            latest_rankings = ranking.loc[ranking.groupby(['SEASON_ID', 'TEAM_ID'])['STANDINGSDATE'].idxmax()]
-            
-            conf_comparison = latest_rankings.groupby(['SEASON_YEAR', 'CONFERENCE']).agg({
-                'W_PCT': 'mean'
-            }).reset_index()
-            
-            fig_conf = px.line(
-                conf_comparison,
-                x='SEASON_YEAR',
-                y='W_PCT',
-                color='CONFERENCE',
-                markers=True,
-                title='Average Win Rate by Conference Over Time',
-                color_discrete_map={'East': '#667eea', 'West': '#f093fb'}
-            )
-            
-            fig_conf.update_layout(
-                template='plotly_dark',
-                height=400,
-                yaxis_title='Average Win %',
-                xaxis_title='Season'
-            )
-            
-            st.plotly_chart(fig_conf, use_container_width=True)
-        
-        with col2:
-            # Overall conference comparison for selected season
-            season_ranking = latest_rankings[latest_rankings['SEASON_YEAR'] == selected_season]
-            
-            if not season_ranking.empty:
-                conf_box = px.box(
-                    season_ranking,
-                    x='CONFERENCE',
-                    y='W_PCT',
-                    color='CONFERENCE',
-                    title=f'Win % Distribution by Conference ({selected_season})',
-                    color_discrete_map={'East': '#667eea', 'West': '#f093fb'}
-                )
-                conf_box.update_layout(template='plotly_dark', height=400)
-                st.plotly_chart(conf_box, use_container_width=True)
-            else:
-                st.info(f"No ranking data available for {selected_season}")
-        
-        st.markdown("---")
-        st.markdown('<p class="section-title">Selected Team Performance Analysis</p>', unsafe_allow_html=True)
-        
-        if selected_team != 'All Teams':
-            # Get team ID
-            team_info = teams[teams['NICKNAME'] == selected_team]
-            
-            if not team_info.empty:
-                team_id = team_info['TEAM_ID'].values[0]
-                
-                # Filter games for selected team and season
-                team_home = games[(games['HOME_TEAM_ID'] == team_id) & (games['SEASON'] == selected_season)]
-                team_away = games[(games['VISITOR_TEAM_ID'] == team_id) & (games['SEASON'] == selected_season)]
-                
-                # Calculate wins and losses
-                home_wins = len(team_home[team_home['HOME_TEAM_WINS'] == 1])
-                home_losses = len(team_home[team_home['HOME_TEAM_WINS'] == 0])
-                away_wins = len(team_away[team_away['HOME_TEAM_WINS'] == 0])
-                away_losses = len(team_away[team_away['HOME_TEAM_WINS'] == 1])
-                
-                total_wins = home_wins + away_wins
-                total_losses = home_losses + away_losses
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                col1.metric("Total Wins", total_wins)
-                col2.metric("Total Losses", total_losses)
-                col3.metric("Home Record", f"{home_wins}-{home_losses}")
-                col4.metric("Road Record", f"{away_wins}-{away_losses}")
-                
-                # Create win/loss trend over the season
-                team_games = pd.concat([
-                    team_home.assign(IS_HOME=1, WIN=team_home['HOME_TEAM_WINS']),
-                    team_away.assign(IS_HOME=0, WIN=1 - team_away['HOME_TEAM_WINS'])
-                ])
-                
-                if not team_games.empty:
-                    team_games = team_games.sort_values('GAME_DATE_EST')
-                    team_games['CUMULATIVE_WINS'] = team_games['WIN'].cumsum()
-                    team_games['GAMES_PLAYED'] = range(1, len(team_games) + 1)
-                    team_games['WIN_PCT'] = team_games['CUMULATIVE_WINS'] / team_games['GAMES_PLAYED']
-                    
-                    fig_trend = go.Figure()
-                    
-                    fig_trend.add_trace(go.Scatter(
-                        x=team_games['GAMES_PLAYED'],
-                        y=team_games['WIN_PCT'] * 100,
-                        mode='lines+markers',
-                        name='Win %',
-                        line=dict(color='#667eea', width=3),
-                        fill='tozeroy',
-                        fillcolor='rgba(102, 126, 234, 0.3)'
-                    ))
-                    
-                    fig_trend.add_hline(y=50, line_dash="dash", line_color="orange",
-                                         annotation_text=".500 Record")
-                    
-                    fig_trend.update_layout(
-                        title=f'{selected_team} Win Percentage Trend ({selected_season})',
-                        xaxis_title='Games Played',
-                        yaxis_title='Win Percentage (%)',
-                        template='plotly_dark',
-                        height=400
-                    )
-                    
-                    st.plotly_chart(fig_trend, use_container_width=True)
-                    
-                    # Business insight
-                    final_win_pct = (total_wins / (total_wins + total_losses)) * 100 if (total_wins + total_losses) > 0 else 0
-                    
-                    st.markdown(f"""
-                    <div class="insight-box">
-                    <strong>🎯 Team Performance Summary: {selected_team}</strong><br><br>
-                    The {selected_team} finished the {selected_season} season with a 
-                    <strong>{final_win_pct:.1f}%</strong> win rate ({total_wins}-{total_losses}).<br><br>
-                    <em>{'Strong playoff contender status maintained.' if final_win_pct >= 60 else 
-                       'Reliable mid-tier performance.' if final_win_pct >= 45 else
-                       'Rebuilding phase indicated.'}</em>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.warning(f"No game data found for {selected_team} in {selected_season}")
-            else:
-                st.warning("Team not found in database")
-        else:
-            st.info("👆 Select a specific team from the sidebar to view detailed performance analysis.")
+        if tab2.open:
+            render_team_dynamics(games, teams, ranking, selected_season, selected_team)
     
-    # ============================================================================
-    # TAB 3: PLAYER IMPACT (EFFICIENCY)
-    # ============================================================================
     with tab3:
-        st.markdown('<p class="section-title">Player Efficiency Analysis: Usage vs. Output</p>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        This analysis identifies key performers by comparing their **shot attempts (Usage)** 
-        against **points scored (Efficiency)**. Players in the upper-right quadrant 
-        represent high-volume, high-efficiency scorers.
-        """)
-        
-        col1, col2 = st.columns([1, 3])
-        
-        with col1:
-            # Get games for the selected season
-            season_games = games[games['SEASON'] == selected_season]['GAME_ID'].unique()
-            
-            # Filter player stats for those games
-            season_player_stats = games_details[games_details['GAME_ID'].isin(season_games)]
-            
-            # Aggregate player stats
-            player_agg = season_player_stats.groupby('PLAYER_NAME').agg({
-                'FGA': 'sum',
-                'PTS': 'sum',
-                'FGM': 'sum',
-                'AST': 'sum',
-                'REB': 'sum',
-                'GAME_ID': 'count'
-            }).reset_index()
-            
-            player_agg.columns = ['PLAYER_NAME', 'TOTAL_FGA', 'TOTAL_PTS', 'TOTAL_FGM', 'TOTAL_AST', 'TOTAL_REB', 'GAMES_PLAYED']
-            
-            # Filter for players with sufficient attempts
-            min_games = st.slider("Minimum Games Played", 10, 50, 20)
-            min_fga = st.slider("Minimum Field Goal Attempts", 50, 500, 200)
-            
-            qualified_players = player_agg[
-                (player_agg['GAMES_PLAYED'] >= min_games) & 
-                (player_agg['TOTAL_FGA'] >= min_fga)
-            ]
-            
-            qualified_players['FG_PCT'] = qualified_players['TOTAL_FGM'] / qualified_players['TOTAL_FGA'] * 100
-            qualified_players['PPG'] = qualified_players['TOTAL_PTS'] / qualified_players['GAMES_PLAYED']
-            qualified_players['USAGE_RATE'] = qualified_players['TOTAL_FGA'] / qualified_players['GAMES_PLAYED']
-            
-            st.markdown(f"**{len(qualified_players)}** players qualified")
-        
-        with col2:
-            if not qualified_players.empty:
-                fig_player = px.scatter(
-                    qualified_players,
-                    x='USAGE_RATE',
-                    y='PPG',
-                    size='GAMES_PLAYED',
-                    color='FG_PCT',
-                    hover_name='PLAYER_NAME',
-                    hover_data={
-                        'USAGE_RATE': ':.1f',
-                        'PPG': ':.1f',
-                        'FG_PCT': ':.1f',
-                        'GAMES_PLAYED': True
-                    },
-                    title=f'Player Usage (FGA/Game) vs Efficiency (PPG) - {selected_season}',
-                    color_continuous_scale='Viridis'
-                )
-                
-                fig_player.update_layout(
-                    template='plotly_dark',
-                    height=500,
-                    xaxis_title='Usage (FGA per Game)',
-                    yaxis_title='Points per Game',
-                    coloraxis_colorbar_title='FG%'
-                )
-                
-                # Add quadrant lines
-                median_x = qualified_players['USAGE_RATE'].median()
-                median_y = qualified_players['PPG'].median()
-                
-                fig_player.add_hline(y=median_y, line_dash="dot", line_color="gray", opacity=0.5)
-                fig_player.add_vline(x=median_x, line_dash="dot", line_color="gray", opacity=0.5)
-                
-                st.plotly_chart(fig_player, use_container_width=True)
-                
-                # Top performers
-                st.markdown("### 🌟 Top Performers (High Usage + High Efficiency)")
-                
-                top_performers = qualified_players[
-                    (qualified_players['USAGE_RATE'] > median_x) & 
-                    (qualified_players['PPG'] > median_y)
-                ].nlargest(10, 'PPG')[['PLAYER_NAME', 'PPG', 'USAGE_RATE', 'FG_PCT', 'GAMES_PLAYED']]
-                
-                top_performers.columns = ['Player', 'PPG', 'FGA/Game', 'FG%', 'Games']
-                
-                st.dataframe(
-                    top_performers.style.format({
-                        'PPG': '{:.1f}',
-                        'FGA/Game': '{:.1f}',
-                        'FG%': '{:.1f}%'
-                    }),
-                    use_container_width=True,
-                    hide_index=True
-                )
-                
-                # Business insight
-                if len(top_performers) > 0:
-                    top_player = top_performers.iloc[0]['Player']
-                    st.markdown(f"""
-                    <div class="insight-box">
-                    <strong>💎 Player Efficiency Insight</strong><br><br>
-                    <strong>{top_player}</strong> leads as the most impactful scorer in {selected_season}, 
-                    combining elite volume shooting with exceptional efficiency.<br><br>
-                    <em>Players in the upper-right quadrant are the "franchise cornerstones" — 
-                    they can handle high-volume offensive responsibility while maintaining 
-                    above-average conversion rates. These are the assets worth investing in.</em>
-                    </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.warning("No players meet the minimum criteria. Try lowering the filters.")
+        if tab3.open:
+            render_player_impact(games_details, selected_season)
     
     # ============================================================================
     # FOOTER